@@ -252,20 +252,18 @@ class CommandLine:
         :return: An instance of Image or None if it fails
         """
         path = args.input
-        with open(path, "rb") as f:
-            data = f.read()
 
-            oob_size = args.oob if args.oob is not None and args.oob > 0 else -1
-            page_size = args.pagesize if args.pagesize is not None and args.pagesize > 0 else -1
-            block_size = args.blocksize if args.blocksize is not None and args.blocksize > 0 else -1
+        oob_size = args.oob if args.oob is not None and args.oob > 0 else -1
+        page_size = args.pagesize if args.pagesize is not None and args.pagesize > 0 else -1
+        block_size = args.blocksize if args.blocksize is not None and args.blocksize > 0 else -1
 
-            mtd = Image(data, block_size, page_size, oob_size)
+        mtd = Image.from_path(path, block_size, page_size, oob_size)
 
-            peb_threshold = args.pebthreshold
-            if peb_threshold is not None:
-                setattr(mtd, "peb_threshold", peb_threshold)
+        peb_threshold = args.pebthreshold
+        if peb_threshold is not None:
+            setattr(mtd, "peb_threshold", peb_threshold)
 
-            return mtd
+        return mtd
 
     def _initialize_ubi(self, image: Image, args: argparse.Namespace) -> UBI:
         """
@@ -1,21 +1,27 @@
+from __future__ import annotations
+
 import errno
-import logging
+import operator
 import os
 import sys
 import tempfile
 from datetime import datetime
-from typing import Dict, List
-
-from ubift.framework import ubifs
-from ubift.framework.mtd import Image
-from ubift.framework.structs.ubi_structs import UBI_VTBL_RECORD
-from ubift.framework.structs.ubifs_structs import UBIFS_DENT_NODE, UBIFS_INODE_TYPES, UBIFS_INO_NODE, UBIFS_KEY, \
-    UBIFS_DATA_NODE, UBIFS_KEY_TYPES, UBIFS_CH, UBIFS_JOURNAL_HEADS
-from ubift.framework.ubi import UBIVolume
-from ubift.framework.ubifs import UBIFS, Journal
+from typing import Dict, List, TYPE_CHECKING
+
+from ubift.framework.structs.ubifs_structs import UBIFS_INODE_TYPES, UBIFS_KEY, UBIFS_KEY_TYPES, \
+    UBIFS_JOURNAL_HEADS
 from ubift.framework.util import crc32
 from ubift.logging import ubiftlog
 
+# These are only needed for type annotations; importing them lazily keeps the CLI cold start
+# from pulling in the whole UBI/UBIFS import graph just to render something.
+if TYPE_CHECKING:
+    from ubift.framework.mtd import Image
+    from ubift.framework.structs.ubi_structs import UBI_VTBL_RECORD
+    from ubift.framework.structs.ubifs_structs import UBIFS_DENT_NODE, UBIFS_INO_NODE, UBIFS_DATA_NODE
+    from ubift.framework.ubi import UBIVolume
+    from ubift.framework.ubifs import UBIFS, Journal
+
 
 def readable_size(num: int, suffix="B"):
     """
@@ -34,18 +40,6 @@ def readable_size(num: int, suffix="B"):
     return f"{num:.1f}Yi{suffix}"
 
 
-def zpad(num: int, len: str) -> int:
-    """
-    Pads a number with a given amount of zeroes.
-    Example: "1" with len of 3 will be padded to 001
-    :param num: The number to be padded with zeroes.
-    :param len: How many digits the output number will contain, filled with zeroes at the beginning.
-    :return: Zero-padded digit.
-    """
-    len = "0" + str(len)
-    return format(num, len)
-
-
 def render_recoverability_info(image: Image, ubifs: UBIFS, scanned_inodes: dict,
                                scanned_dents: dict, scanned_data_nodes: dict, inode_info: bool = False, outfd=sys.stdout) -> None:
     """
@@ -84,10 +78,10 @@ def render_recoverability_info(image: Image, ubifs: UBIFS, scanned_inodes: dict,
             if inode_info:
                 if inode.ino_size != 0:
                     outfd.write(
-                        f"{zpad(inum, 6)}\t\t{zpad(inode.ino_size, 13)}\t\t{zpad(recoverable, 13)}\t\t{'{:.0%}'.format(recoverable / inode.ino_size)}\n")
+                        f"{inum:06d}\t\t{inode.ino_size:013d}\t\t{recoverable:013d}\t\t{'{:.0%}'.format(recoverable / inode.ino_size)}\n")
                 else:
                     outfd.write(
-                        f"{zpad(inum, 6)}\t\t{zpad(inode.ino_size, 13)}\t\t{zpad(recoverable, 13)}\t\t0%\n")
+                        f"{inum:06d}\t\t{inode.ino_size:013d}\t\t{recoverable:013d}\t\t0%\n")
 
     outfd.write(f"Deleted Inodes found: {deleted_inodes}\n")
     outfd.write(f"Accumulated Deleted Inode Size: {total_size} ({readable_size(total_size)})\n")
@@ -294,26 +288,28 @@ def render_ubi_instances(image: Image, outfd=sys.stdout) -> None:
 
     # outfd.write(f"UBI Instances: {len(ubi_instances)}\n\n")
 
-    outfd.write(f"Units are in {readable_size(image.block_size)}-Erase Blocks\n")
-    for i, ubi in enumerate(ubi_instances):
-        outfd.write("\tStart\t\t\tEnd\t\t\tLength\n")
-        index = zpad(i, 4)
-        start = zpad(ubi.partition.offset // image.block_size, 10)
-        end = zpad(ubi.partition.end // image.block_size, 10)
-        length = zpad(len(ubi) // image.block_size, 10)
-        outfd.write(f"{index}:\t{start}\t\t{end}\t\t{length}\n")
-
-        outfd.write(f"|\n")
-        outfd.write(f"|\tVolumes\n")
-        outfd.write("|\tIndex\t\t\tReserved PEBs\t\tType\t\t\tName\n")
-        for i, vol in enumerate(ubi.volumes):
+    bs = image.block_size
+    write = outfd.write
+    write(f"Units are in {readable_size(bs)}-Erase Blocks\n")
+    for ubi_index, ubi in enumerate(ubi_instances):
+        partition = ubi.partition
+        write("\tStart\t\t\tEnd\t\t\tLength\n")
+        start = f"{partition.offset // bs:010d}"
+        end = f"{partition.end // bs:010d}"
+        length = f"{len(ubi) // bs:010d}"
+        write(f"{ubi_index:04d}:\t{start}\t\t{end}\t\t{length}\n")
+
+        write(f"|\n")
+        write(f"|\tVolumes\n")
+        write("|\tIndex\t\t\tReserved PEBs\t\tType\t\t\tName\n")
+        for vol in ubi.volumes:
             vol_index = vol._vol_num
             vol_reserved_pebs = vol._vtbl_record.reserved_pebs
             vol_type = "STATIC" if vol._vtbl_record.vol_type == 2 else "DYNAMIC" if vol._vtbl_record.vol_type == 1 else "UNKNOWN"
             vol_name = vol.name
 
-            outfd.write(f"|\t{vol_index}\t\t\t{zpad(vol_reserved_pebs, 10)}\t\t{vol_type}\t\t\t{vol_name}\n")
-        outfd.write(f"\n")
+            write(f"|\t{vol_index}\t\t\t{vol_reserved_pebs:010d}\t\t{vol_type}\t\t\t{vol_name}\n")
+        write(f"\n")
 
 
 def render_lebs(vol: UBIVolume, outfd=sys.stdout):
@@ -326,12 +322,23 @@ def render_lebs(vol: UBIVolume, outfd=sys.stdout):
     """
     # outfd.write(f"UBI Volume Index:{vol._vol_num} Name:{vol.name}\n\n")
 
-    outfd.write("LEB\t--->\tPEB\n")
-
-    lebs = list(vol.lebs.values())
-    lebs.sort(key=lambda leb: leb.leb_num)
-    for leb in lebs:
-        outfd.write(f"{zpad(leb.leb_num, 5)}\t--->\t{zpad(leb._peb_num, 5)}\n")
+    lebs = sorted(vol.lebs.values(), key=operator.attrgetter("leb_num"))
+
+    # Writing to a text stream costs an encode and a buffered write per call; for volumes with
+    # thousands of LEBs everything is pre-encoded and pushed to the underlying binary buffer at once.
+    buffer = getattr(outfd, "buffer", None)
+    if buffer is not None:
+        blob = [b"LEB\t--->\tPEB\n"]
+        append = blob.append
+        for leb in lebs:
+            append(f"{leb.leb_num:05d}\t--->\t{leb._peb_num:05d}\n".encode())
+        outfd.flush()
+        buffer.write(b"".join(blob))
+    else:
+        write = outfd.write
+        write("LEB\t--->\tPEB\n")
+        for leb in lebs:
+            write(f"{leb.leb_num:05d}\t--->\t{leb._peb_num:05d}\n")
 
 
 def write_to_file(inode: UBIFS_INO_NODE, data_nodes: List[UBIFS_DATA_NODE], abs_path: str) -> None:
@@ -501,31 +508,39 @@ def render_dents(ubifs: UBIFS, dents: Dict[int, UBIFS_DENT_NODE], full_paths: bo
     dent_list = dents.values() if isinstance(dents, Dict) else dents
 
     outfd.write("Type\tInode\tParent\tName\n")
+    # Lines are collected and flushed in batches so that directories with thousands of dents
+    # do not pay for one buffered-IO write call per field.
+    # Hot-loop attribute lookups are bound to locals once.
+    lines = []
+    append = lines.append
+    type_names = _INODE_TYPE_NAMES
+    from_bytearray = UBIFS_KEY.from_bytearray
+    unroll_path = ubifs._unroll_path
     for dent in dent_list:
         # TODO: This method supports Dict[int, UBIFS_DENT_NODE] and Dict[int, list[UBIFS_DENT_NODE]] therefore this is needed but maybe it can be implemented in a better way
-        if isinstance(dent, list):
-            for dent2 in dent:
-                if deleted and dent2.inum != 0:
-                    continue
-                render_inode_type(dent2.type)
-                outfd.write(f"\t{dent2.inum}")
-                outfd.write(f"\t{UBIFS_KEY.from_bytearray(dent2.key).inode_num}\t")
-                if full_paths:
-                    outfd.write(f"{ubifs._unroll_path(dent2, dents)}")
-                else:
-                    outfd.write(f"{dent2.formatted_name()}")
-                outfd.write("\n")
-        else:
-            if deleted and dent.inum != 0:
+        for dent2 in (dent if isinstance(dent, list) else [dent]):
+            if deleted and dent2.inum != 0:
                 continue
-            render_inode_type(dent.type)
-            outfd.write(f"\t{dent.inum}")
-            outfd.write(f"\t{UBIFS_KEY.from_bytearray(dent.key).inode_num}\t")
-            if full_paths:
-                outfd.write(f"{ubifs._unroll_path(dent, dents)}")
-            else:
-                outfd.write(f"{dent.formatted_name()}")
-            outfd.write("\n")
+            inode_type = type_names.get(dent2.type, "unkn")
+            parent_inum = from_bytearray(dent2.key).inode_num
+            name = unroll_path(dent2, dents) if full_paths else dent2.formatted_name()
+            append(f"{inode_type}\t{dent2.inum}\t{parent_inum}\t{name}\n")
+            if len(lines) >= 4096:
+                outfd.writelines(lines)
+                lines.clear()
+    outfd.writelines(lines)
+
+
+# Readable names of UBIFS_INODE_TYPES, used as a lookup table instead of branching per dent
+_INODE_TYPE_NAMES = {
+    UBIFS_INODE_TYPES.UBIFS_ITYPE_REG: "file",
+    UBIFS_INODE_TYPES.UBIFS_ITYPE_DIR: "dir",
+    UBIFS_INODE_TYPES.UBIFS_ITYPE_LNK: "link",
+    UBIFS_INODE_TYPES.UBIFS_ITYPE_BLK: "blk",
+    UBIFS_INODE_TYPES.UBIFS_ITYPE_CHR: "chr",
+    UBIFS_INODE_TYPES.UBIFS_ITYPE_FIFO: "link",
+    UBIFS_INODE_TYPES.UBIFS_ITYPE_SOCK: "sock",
+}
 
 
 def render_inode_type(inode_type: int, outfd=sys.stdout):
@@ -534,22 +549,7 @@ def render_inode_type(inode_type: int, outfd=sys.stdout):
     :param inode_type:
     :return:
     """
-    if inode_type == UBIFS_INODE_TYPES.UBIFS_ITYPE_REG:
-        outfd.write(f"file")
-    elif inode_type == UBIFS_INODE_TYPES.UBIFS_ITYPE_DIR:
-        outfd.write(f"dir")
-    elif inode_type == UBIFS_INODE_TYPES.UBIFS_ITYPE_LNK:
-        outfd.write(f"link")
-    elif inode_type == UBIFS_INODE_TYPES.UBIFS_ITYPE_BLK:
-        outfd.write(f"blk")
-    elif inode_type == UBIFS_INODE_TYPES.UBIFS_ITYPE_CHR:
-        outfd.write(f"chr")
-    elif inode_type == UBIFS_INODE_TYPES.UBIFS_ITYPE_FIFO:
-        outfd.write(f"link")
-    elif inode_type == UBIFS_INODE_TYPES.UBIFS_ITYPE_SOCK:
-        outfd.write(f"sock")
-    else:
-        outfd.write(f"unkn")
+    outfd.write(_INODE_TYPE_NAMES.get(inode_type, "unkn"))
 
 
 def render_image(image: Image, outfd=sys.stdout) -> None:
@@ -559,26 +559,29 @@ def render_image(image: Image, outfd=sys.stdout) -> None:
     :param outfd:
     :return:
     """
+    bs = image.block_size
+    data_len = len(image.data)
+
     outfd.write(f"MTD Image\n\n")
-    outfd.write(f"Size: {readable_size(len(image.data))}\n")
+    outfd.write(f"Size: {readable_size(data_len)}\n")
 
-    outfd.write(f"Erase Block Size: {readable_size(image.block_size)}\n")
+    outfd.write(f"Erase Block Size: {readable_size(bs)}\n")
     outfd.write(f"Page Size: {readable_size(image.page_size)}\n")
     outfd.write(f"OOB Size: {readable_size(image.oob_size)}\n\n")
 
-    outfd.write(f"Physical Erase Blocks: {len(image.data) // image.block_size}\n")
-    outfd.write(f"Pages per Erase Block: {image.block_size // image.page_size}\n")
+    outfd.write(f"Physical Erase Blocks: {data_len // bs}\n")
+    outfd.write(f"Pages per Erase Block: {bs // image.page_size}\n")
     outfd.write("\n")
 
-    outfd.write(f"Units are in {readable_size(image.block_size)}-Erase Blocks\n")
+    outfd.write(f"Units are in {readable_size(bs)}-Erase Blocks\n")
     mtd_parts = image.partitions
 
     outfd.write("\tStart\t\t\tEnd\t\t\tLength\t\t\tDescription\n")
     for i, partition in enumerate(mtd_parts):
-        start = zpad(partition.offset // image.block_size, 10)
-        end = zpad(partition.end // image.block_size, 10)
-        length = zpad(len(partition) // image.block_size, 10)
-        outfd.write(f"{zpad(i, 3)}:\t{start}\t\t{end}\t\t{length}\t\t{partition.name}\n")
+        start = f"{partition.offset // bs:010d}"
+        end = f"{partition.end // bs:010d}"
+        length = f"{len(partition) // bs:010d}"
+        outfd.write(f"{i:03d}:\t{start}\t\t{end}\t\t{length}\t\t{partition.name}\n")
 
     # TODO: Maybe add a switch if sizes in bytes are prefered?
     # outfd.write("\tStart\t\t\tEnd\t\t\tLength\t\t\tDescription\n")
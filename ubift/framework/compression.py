@@ -5,7 +5,9 @@ import zstandard
 import lzo
 
 from ubift import exception
-from ubift.framework.structs.ubifs_structs import UBIFS_COMPRESSION_TYPE
+# The module (not the enum itself) is imported here to break the import cycle with ubifs_structs,
+# which imports this module at load time
+from ubift.framework.structs import ubifs_structs
 from ubift.logging import ubiftlog
 
 
@@ -30,6 +32,6 @@ def decompress(data: bytes, compr_type: int, size: int = None) -> bytes:
             raise exception.UBIFTException(f"Data is compressed with unknown type. ({compr_type})")
     except Exception as e:
         ubiftlog.warn(
-            f"[-] Error while decompressing data using {UBIFS_COMPRESSION_TYPE(compr_type).name}: {e}")
+            f"[-] Error while decompressing data using {ubifs_structs.UBIFS_COMPRESSION_TYPE(compr_type).name}: {e}")
         return bytes()
 
@@ -1,14 +1,82 @@
 from __future__ import annotations
 
 import logging
+import mmap
 from typing import List
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+    prange = range
+
 from ubift.exception import UBIFTException
 from ubift.framework.structs.ubi_structs import UBI_EC_HDR
 from ubift.framework.util import find_signature
 
 ubiftlog = logging.getLogger(__name__)
 
+
+def _probe_block_size(arr: "np.ndarray", ec_hdr_offset: int, page_size: int, oob_size: int) -> int:
+    """
+    Scans for the next UBI_EC_HDR magic after ec_hdr_offset by probing every possible block size,
+    i.e., multiples of the page size (plus OOB if present). Operates on a uint8 view so that it can
+    be JIT-compiled by Numba into a tight native loop.
+    :return: The guessed block size (without OOB) or -1 if no further magic was found.
+    """
+    stride = page_size + (oob_size if oob_size > 0 else 0)
+    m0 = arr[ec_hdr_offset]
+    m1 = arr[ec_hdr_offset + 1]
+    m2 = arr[ec_hdr_offset + 2]
+    m3 = arr[ec_hdr_offset + 3]
+    for i in range(1, 1024):
+        off = ec_hdr_offset + i * stride
+        if off + 4 > arr.size:
+            break
+        if arr[off] == m0 and arr[off + 1] == m1 and arr[off + 2] == m2 and arr[off + 3] == m3:
+            return i * page_size
+    return -1
+
+
+if njit is not None:
+    _probe_block_size = njit(cache=True)(_probe_block_size)
+
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _strip_oob_kernel(src, dst, page_size, oob_size, pages_per_block, n_blocks):
+        """
+        Copies the data part of every page from src to dst, skipping the per-page OOB areas.
+        Blocks are independent, so the outer loop runs in parallel via prange.
+        """
+        full_page_size = page_size + oob_size
+        for block in prange(n_blocks):
+            src_base = block * pages_per_block * full_page_size
+            dst_base = block * pages_per_block * page_size
+            for page in range(pages_per_block):
+                src_off = src_base + page * full_page_size
+                dst_off = dst_base + page * page_size
+                dst[dst_off:dst_off + page_size] = src[src_off:src_off + page_size]
+else:
+    _strip_oob_kernel = None
+
+
+def _find_all_magic(data: bytes, magic: bytes) -> "np.ndarray":
+    """
+    Finds all 4-byte-aligned occurrences of a 4-byte magic in one vectorized pass by reinterpreting
+    the buffer as little-endian uint32 and comparing it against the magic word. EC headers sit at
+    PEB boundaries, so the alignment restriction costs nothing for them.
+    :return: Sorted ndarray of byte offsets of all hits
+    """
+    magic_word = int.from_bytes(magic, "little")
+    arr32 = np.frombuffer(data, dtype="<u4", count=len(data) // 4)
+    return np.nonzero(arr32 == magic_word)[0] * 4
+
 class Image:
     """
     A Image is a raw dump file, i.e., bunch of bytes from a NAND flash.
@@ -18,11 +86,21 @@ class Image:
     The page_size is the minimal I/O unit, without OOB
     If pages contain an extra OOB area after their data, this can be specified in 'oob_size'
     """
+    # 'peb_threshold' is not set here but may be attached by the CLI for the UBIPartitioner
+    __slots__ = ("_oob_size", "_page_size", "_block_size", "_data", "_partitions", "_ec_hdr_offsets",
+                 "peb_threshold")
+
     def __init__(self, data: bytes, block_size: int = -1, page_size: int = -1, oob_size: int = -1):
         self._oob_size = oob_size
+        # All UBI_EC_HDR positions are precomputed once so that size guessing and partitioning
+        # do not have to rescan the whole dump for the same magic over and over.
+        self._ec_hdr_offsets = _find_all_magic(data, UBI_EC_HDR.__magic__) if np is not None else None
         self._page_size = page_size if page_size > 0 else self._guess_page_size(data)
         self._block_size = block_size if block_size > 0 else self._guess_block_size(data)
         self._data = data if oob_size <= 0 else Image.strip_oob(data, self.block_size, self.page_size, oob_size)
+        if oob_size > 0 and np is not None:
+            # Stripping the OOB shifted all offsets, so the cache has to be rebuilt on the stripped data
+            self._ec_hdr_offsets = _find_all_magic(self._data, UBI_EC_HDR.__magic__)
         self._partitions = []
 
         if len(self._data) % block_size != 0:
@@ -34,6 +112,18 @@ class Image:
 
         ubiftlog.info(f"[!] Initialized Image (block_size:{self.block_size}, page_size:{self.page_size}, oob_size:{self.oob_size}, data_len:{len(self.data)})")
 
+    @classmethod
+    def from_path(cls, path: str, block_size: int = -1, page_size: int = -1, oob_size: int = -1) -> Image:
+        """
+        Creates an Image from a dump file. The file is memory-mapped instead of being read into memory,
+        so the OS demand-pages its content and multi-GiB dumps do not force a full in-memory copy.
+        :param path: Path to the dump file
+        :return: An instance of Image backed by a read-only mmap
+        """
+        with open(path, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(data, block_size, page_size, oob_size)
+
     @property
     def partitions(self) -> List[Partition]:
         if len(self._partitions) == 0:
@@ -60,6 +150,27 @@ class Image:
     def page_size(self):
         return self._page_size
 
+    def find_ec_hdr(self, start: int = 0) -> int:
+        """
+        Finds the next UBI_EC_HDR signature at or after the given offset, consulting the precomputed
+        offset cache instead of rescanning the data if possible.
+        :param start: Offset to start searching from
+        :return: Offset of the next UBI_EC_HDR signature or -1 if there is none
+        """
+        if self._ec_hdr_offsets is not None and len(self._ec_hdr_offsets) > 0:
+            index = np.searchsorted(self._ec_hdr_offsets, start)
+            return int(self._ec_hdr_offsets[index]) if index < len(self._ec_hdr_offsets) else -1
+        return find_signature(self.data, UBI_EC_HDR.__magic__, start)
+
+    def _first_ec_hdr(self, data: bytes) -> int:
+        """
+        Returns the offset of the first UBI_EC_HDR signature in the given data, preferring the
+        precomputed offset cache. Used during size guessing, where self.data is not available yet.
+        """
+        if self._ec_hdr_offsets is not None and len(self._ec_hdr_offsets) > 0:
+            return int(self._ec_hdr_offsets[0])
+        return find_signature(data, UBI_EC_HDR.__magic__)
+
     def _guess_block_size(self, data: bytes) -> int:
         """
         Tries to 'guess' the size of a PEB. This is done by searching for a "UBI#" signature (ec-header)
@@ -68,18 +179,18 @@ class Image:
         :param data:
         :return: Size of a PEB or raises an exception if guess failed.
         """
-        ec_hdr_offset = find_signature(data, UBI_EC_HDR.__magic__)
+        ec_hdr_offset = self._first_ec_hdr(data)
         if ec_hdr_offset < 0:
             raise UBIFTException("Block size not specified, cannot guess size neither because no UBI_EC_HDR signatures found.")
-        possible_block_sizes = [i*self.page_size if self.oob_size < 0 else (i*self.page_size+i*self.oob_size) for i in range(1, 1024)]
 
-        # print(possible_block_sizes)
-        # print(ec_hdr_offset)
-        # a = find_signature(data, UBI_EC_HDR.__magic__, ec_hdr_offset + 1)
-        # print(a)
-        # print(a - ec_hdr_offset)
-        # exit()
+        if np is not None:
+            guessed_size = _probe_block_size(np.frombuffer(data, dtype=np.uint8), ec_hdr_offset, self.page_size, self.oob_size)
+            if guessed_size > 0:
+                ubiftlog.info(f"[+] Guessed block_size: {guessed_size} ({guessed_size / 1024}KiB)")
+                return guessed_size
+            raise UBIFTException(f"[-] Block size not specified, cannot guess size neither.")
 
+        possible_block_sizes = [i*self.page_size if self.oob_size < 0 else (i*self.page_size+i*self.oob_size) for i in range(1, 1024)]
         for i,block_size in enumerate(possible_block_sizes):
             if data[ec_hdr_offset+block_size:ec_hdr_offset+block_size+4] == UBI_EC_HDR.__magic__:
                 guessed_size = (self.page_size * (i+1))
@@ -94,7 +205,7 @@ class Image:
         This is simply done by looking at the 'vid_hdr_offset' field of an ec-header.
         :return: Size of a page or raises an exception if guess failed.
         """
-        ec_hdr_offset = find_signature(data, UBI_EC_HDR.__magic__)
+        ec_hdr_offset = self._first_ec_hdr(data)
         if ec_hdr_offset < 0:
             raise UBIFTException(
                 "Page size not specified, cannot guess size neither because no UBI_EC_HDR signatures found.")
@@ -106,35 +217,83 @@ class Image:
         raise UBIFTException(f"[-] Page size not specified, cannot guess size neither.")
 
     @classmethod
-    def strip_oob(cls, data: bytes, block_size: int, page_size: int, oob_size: int) -> bytes:
+    def strip_oob(cls, data: bytes, block_size: int, page_size: int, oob_size: int, out: bytearray = None) -> bytes:
         """
         Strips OOB data out of binary data. This assumes that the OOB is located at the end of every page.
         TODO: OOB can also be located as a group in some flashes (needs testing)
+        :param out: Optional preallocated bytearray of at least pages * page_size bytes. If given, the
+         stripped data is written into it and it is returned instead of a freshly allocated bytes object.
         """
 
         ubiftlog.info(f"[!] Stripping OOB with size {oob_size} from every page.")
 
-        ptr = 0
-        pages = block_size // page_size
-        block_size = block_size + pages * oob_size
-        blocks = len(data) // block_size
+        full_page_size = page_size + oob_size
+        pages = len(data) // full_page_size
+
+        if np is None:
+            return cls._strip_oob_python(data, page_size, oob_size, out)
+
+        src = np.frombuffer(data, dtype=np.uint8)
+        if out is not None:
+            dst = np.frombuffer(out, dtype=np.uint8, count=pages * page_size)
+        else:
+            dst = np.empty(pages * page_size, dtype=np.uint8)
 
-        stripped_data = bytearray()
-        for page in range(0, len(data), 2112):
-            stripped_data += data[page:page + page_size]
+        # With Numba available, whole blocks are stripped by a parallel native kernel
+        pages_per_block = block_size // page_size if page_size > 0 else 0
+        n_blocks = pages // pages_per_block if pages_per_block > 0 else 0
+        done_pages = 0
+        if _strip_oob_kernel is not None and n_blocks > 0:
+            _strip_oob_kernel(src, dst, page_size, oob_size, pages_per_block, n_blocks)
+            done_pages = n_blocks * pages_per_block
 
-        return bytes(stripped_data)
+        if done_pages < pages:
+            # View the remaining pages as a (pages x page_size+oob_size) matrix and cut off the OOB
+            # columns, which strips them in one strided copy instead of a Python loop over every page.
+            remaining = pages - done_pages
+            stripped = src[done_pages * full_page_size:pages * full_page_size] \
+                .reshape(remaining, full_page_size)[:, :page_size]
+            np.copyto(dst[done_pages * page_size:].reshape(remaining, page_size), stripped)
+
+        return out if out is not None else dst.tobytes()
+
+    @classmethod
+    def _strip_oob_python(cls, data: bytes, page_size: int, oob_size: int, out: bytearray = None) -> bytes:
+        """
+        Pure-Python fallback for strip_oob, used when numpy is not available. Writes every page into a
+        preallocated buffer via slice assignment instead of growing a bytearray with '+=', which would
+        trigger repeated reallocations.
+        """
+        full_page_size = page_size + oob_size
+        pages = len(data) // full_page_size
+
+        if out is None:
+            stripped_data = bytearray(pages * page_size)
+            dst = 0
+            for src in range(0, pages * full_page_size, full_page_size):
+                stripped_data[dst:dst + page_size] = data[src:src + page_size]
+                dst += page_size
+            return bytes(stripped_data)
+
+        dst = 0
+        for src in range(0, pages * full_page_size, full_page_size):
+            out[dst:dst + page_size] = data[src:src + page_size]
+            dst += page_size
+        return out
 
 class Partition:
     """
     A Partition represents an MTD-partition.
     """
+    __slots__ = ("_image", "_offset", "_end", "_name", "_ubi_instance", "_mv")
+
     def __init__(self, image: Image, offset: int, end: int, name: str):
         self._image = image
         self._offset = offset
         self._end = end
         self._name = name
         self._ubi_instance = None
+        self._mv = memoryview(image.data)
 
         if len(self) % self.image.block_size != 0:
             ubiftlog.error(f"[-] Partition {self.name} is not aligned to erase block size.")
@@ -148,7 +307,11 @@ class Partition:
 
     @property
     def data(self):
-        return self.image.data[self.offset:self.end+1]
+        """
+        :return: Returns the Partition's data as a zero-copy memoryview. Consumers that really need
+         a bytes object can call .tobytes() on it.
+        """
+        return self._mv[self._offset:self._end+1]
 
     @property
     def ubi_instance(self):
@@ -35,26 +35,19 @@ class Partitioner(ABC):
         Example:  [free space] [UBI] [UBI] [free space] will be filled to [UNALLOCATED] [UBI] [UBI] [UNALLOCATED]
         """
 
-        filled_partitions = partitions.copy()
-        filled_partitions.sort(key=lambda _partition: _partition.offset)
-
-        for i, partition in enumerate(partitions):
-            if i+1 >= len(partitions):
-                # Add 'unallocated' Partition at the end if necessary
-                if partition.end != len(image.data) - 1:
-                    end_partition = Partition(image, partition.end + 1, len(image.data) - 1, UBIPARTITIONER_UNALLOCATED_DESCRIPTION)
-                    filled_partitions.append(end_partition)
-                break
-            # Add 'unallocated' Partition at the start if necessary
-            if i == 0 and (partition.offset != 0):
-                start_partition = Partition(image, 0, partitions[i].offset - 1, UBIPARTITIONER_UNALLOCATED_DESCRIPTION)
-                filled_partitions.insert(0, start_partition)
-            # Add 'unallocated' Partitions in between Partitions if necessary
-            if partition.end + 1 != partitions[i+1].offset:
-                start = partition.end + 1
-                end = partitions[i+1].offset - 1
-                between_partition = Partition(image, start, end, UBIPARTITIONER_UNALLOCATED_DESCRIPTION)
-                filled_partitions.insert(filled_partitions.index(partition)+1, between_partition)
+        filled_partitions = []
+        cursor = 0
+        for partition in sorted(partitions, key=lambda _partition: _partition.offset):
+            # Add an 'unallocated' Partition for any gap before this Partition
+            if partition.offset > cursor:
+                filled_partitions.append(
+                    Partition(image, cursor, partition.offset - 1, UBIPARTITIONER_UNALLOCATED_DESCRIPTION))
+            filled_partitions.append(partition)
+            cursor = partition.end + 1
+        # Add an 'unallocated' Partition at the end if necessary
+        if cursor < len(image.data):
+            filled_partitions.append(
+                Partition(image, cursor, len(image.data) - 1, UBIPARTITIONER_UNALLOCATED_DESCRIPTION))
 
         return filled_partitions
 
@@ -100,7 +93,7 @@ class UBIPartitioner(Partitioner):
         """
         This function tries to create a Partition starting from a position based on continous UBI headers it finds.
         """
-        start = find_signature(image.data, UBI_EC_HDR.__magic__, start)
+        start = image.find_ec_hdr(start)
         if start < 0:
             return None
 
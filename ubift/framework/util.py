@@ -1,3 +1,5 @@
+import re
+from functools import lru_cache
 from typing import List
 
 import crcmod as crcmod
@@ -5,24 +7,25 @@ import crcmod as crcmod
 from ubift.logging import ubiftlog
 
 
+@lru_cache(maxsize=16)
+def _compile_signature(signature: bytes) -> re.Pattern:
+    """
+    Compiles a signature into a regex pattern (wrapped in a lookahead so overlapping hits are found too).
+    Compiled patterns are cached because the same few magics are scanned for over and over.
+    """
+    return re.compile(b"(?=" + re.escape(signature) + b")")
+
+
 def find_signatures(data: bytes, signature: bytes) -> List[int]:
     """
     Scans arbitrary binary data for a specific signature.
+    Uses a precompiled regex so the whole scan runs in C instead of a Python-level find loop.
     :param data:
     :param signature:
     :return: Returns all found hits
     """
-    all_hits = []
     ubiftlog.debug(f"[!] Scanning for Signature {signature}")
-
-    hit = data.find(signature, 0)
-
-    while hit >= 0:
-        all_hits.append(hit)
-        ubiftlog.debug(f"[+] Found Signature {signature} at offset {hit}")
-        hit = data.find(signature, hit + 1)
-
-    return all_hits
+    return [match.start() for match in _compile_signature(signature).finditer(data)]
 
 
 def find_signature(data: bytes, signature: bytes, offset: int = 0) -> int: